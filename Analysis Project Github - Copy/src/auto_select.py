@@ -0,0 +1,116 @@
+import time
+import numpy as np
+from kruskal import kruskal
+from prim import prim
+from boruvka import boruvka
+from reverse_delete import reverse_delete
+
+ENGINES = {
+    'Kruskal': kruskal,
+    'Prim': prim,
+    'Boruvka': boruvka,
+    'Reverse Delete': reverse_delete
+}
+DEFAULT_ENGINE = 'Kruskal'
+
+def graph_features(G):
+    """Cheap O(n + m) statistics used to predict engine runtimes."""
+    n = len(G.nodes)
+    m = len(G.edges)
+    degrees = np.fromiter((d for _, d in G.degree()), dtype=np.float64, count=n) if n else np.zeros(1)
+    weights = np.fromiter((w for _, _, w in G.edges(data='weight', default=1.0)), dtype=np.float64, count=m) if m else np.zeros(1)
+    mean_degree = degrees.mean()
+    mean_weight = weights.mean()
+    return {
+        'n': n,
+        'm': m,
+        'density': 2.0 * m / (n * (n - 1)) if n > 1 else 0.0,
+        'degree_skew': float(degrees.max() / mean_degree) if mean_degree > 0 else 1.0,
+        'weight_cv': float(weights.std() / mean_weight) if mean_weight > 0 else 0.0,
+        'distinct_weight_ratio': float(len(np.unique(weights)) / len(weights))
+    }
+
+def measurement_mode(trace=False, instrument=False, profile=False, track_memory=False):
+    """How a stored run was timed. Tracing, instrumentation and profiling inflate execution_time
+    unevenly across engines; memory tracking runs in a separate pass and does not."""
+    return {'trace': bool(trace), 'instrument': bool(instrument), 'profile': bool(profile), 'track_memory': bool(track_memory)}
+
+def is_clean_timing(metrics):
+    """True when a record's execution_time came from a plain, unobserved run."""
+    mode = metrics.get('measurement')
+    return mode is not None and not (mode['trace'] or mode['instrument'] or mode['profile'])
+
+def _feature_row(features):
+    # log n and log m carry the asymptotic terms; density is their ratio in log space
+    return [
+        1.0,
+        np.log(max(features['n'], 1)),
+        np.log(max(features['m'], 1)),
+        np.log(max(features['density'], 1e-12)),
+        np.log(max(features['degree_skew'], 1.0)),
+        features['weight_cv'],
+        features['distinct_weight_ratio']
+    ]
+
+class CostModel:
+    """Per-engine ridge regression of log runtime on graph statistics, fitted to stored benchmark results.
+    Only records stored with 'features' and a clean measurement mode in their metrics are used."""
+    def __init__(self, ridge=1e-2, min_samples=2):
+        self.ridge = ridge
+        self.min_samples = min_samples
+        self.coefficients = {}
+
+    def fit(self, results_by_algo):
+        self.coefficients = {}
+        for engine in ENGINES:
+            records = [r for r in results_by_algo.get(engine, []) if len(r) > 4 and 'features' in r[4] and is_clean_timing(r[4]) and r[3] > 0]
+            if len(records) < self.min_samples:
+                continue
+            X = np.array([_feature_row(r[4]['features']) for r in records])
+            y = np.log([r[3] for r in records])
+            penalty = self.ridge * np.eye(X.shape[1])
+            penalty[0, 0] = 0.0  # Leave the intercept unpenalized
+            self.coefficients[engine] = np.linalg.solve(X.T @ X + penalty, X.T @ y)
+        return self
+
+    def predict(self, features):
+        """Return predicted seconds per engine that has enough history."""
+        row = np.array(_feature_row(features))
+        return {engine: float(np.exp(row @ coef)) for engine, coef in self.coefficients.items()}
+
+def auto_mst(G, results_by_algo, dataset_name='', trace=False, stats=None):
+    """Run the engine predicted to be fastest on G and record predicted vs actual time.
+    The run is appended to results_by_algo under the chosen engine, so the next fit learns from it.
+    Kruskal is always a candidate: it runs unless its own fitted prediction is beaten, and it is
+    used outright while it has too little history to be compared."""
+    start_time = time.perf_counter()
+    features = graph_features(G)
+    predictions = CostModel().fit(results_by_algo).predict(features)
+    engine = min(predictions, key=predictions.get) if DEFAULT_ENGINE in predictions else DEFAULT_ENGINE
+    selection_time = time.perf_counter() - start_time
+
+    result = ENGINES[engine](G, trace=trace, stats=stats)
+    predicted = predictions.get(engine)
+    result['engine'] = engine
+    result['predicted_time'] = predicted
+    result['predictions'] = predictions
+    result['selection_time'] = selection_time
+
+    predicted_str = f"{predicted:.4f}s" if predicted is not None else "n/a (no history)"
+    print(f"Auto - Engine: {engine}, Predicted: {predicted_str}, Actual: {result['execution_time']:.4f}s, Selection overhead: {selection_time:.4f}s")
+    metrics = {
+        'features': features,
+        'predicted_time': predicted,
+        'auto': True,
+        'measurement': measurement_mode(trace=trace, instrument=stats is not None)
+    }
+    if 'instrumentation' in result:
+        metrics['instrumentation'] = result['instrumentation']
+    results_by_algo.setdefault(engine, []).append((
+        dataset_name,
+        features['n'],
+        features['m'],
+        result['execution_time'],
+        metrics
+    ))
+    return result
\ No newline at end of file
@@ -1,8 +1,11 @@
 import time
-from graph_utils import DisjointSet, validate_mst
+from graph_utils import make_disjoint_set, validate_mst
+from event_trace import EventTrace, OP_ACCEPT, OP_REJECT
+from instrumentation import phase
 
-def boruvka(G):
+def boruvka(G, trace=False, stats=None):
     start_time = time.perf_counter()
+    events = EventTrace() if trace else None
     if not G.nodes:
         return {
             'edges': [],
@@ -11,38 +14,54 @@ def boruvka(G):
             'is_valid': False
         }
 
-    ds = DisjointSet(len(G.nodes))
+    ds = make_disjoint_set(len(G.nodes), stats=stats)
     mst_edges = []
     num_components = len(G.nodes)
+    round_num = 0
 
-    while num_components > 1:
-        cheapest = {i: None for i in range(len(G.nodes))}
-        for u, v, data in G.edges(data=True):
-            pu, pv = ds.find(u), ds.find(v)
-            if pu != pv:
-                weight = data.get('weight', 1.0)
-                if cheapest[pu] is None or weight < cheapest[pu][0]:
-                    cheapest[pu] = (weight, u, v)
-                if cheapest[pv] is None or weight < cheapest[pv][0]:
-                    cheapest[pv] = (weight, u, v)
+    with phase(stats, 'main_loop'):
+        while num_components > 1:
+            round_num += 1
+            cheapest = {i: None for i in range(len(G.nodes))}
+            for u, v, data in G.edges(data=True):
+                pu, pv = ds.find(u), ds.find(v)
+                if pu != pv:
+                    weight = data.get('weight', 1.0)
+                    if cheapest[pu] is None or weight < cheapest[pu][0]:
+                        cheapest[pu] = (weight, u, v)
+                    if cheapest[pv] is None or weight < cheapest[pv][0]:
+                        cheapest[pv] = (weight, u, v)
 
-        added = False
-        for node in range(len(G.nodes)):
-            if cheapest[node] is not None:
-                weight, u, v = cheapest[node]
-                if ds.union(u, v):
-                    mst_edges.append((u, v))
-                    num_components -= 1
-                    added = True
-        if not added:
-            break
+            added = False
+            for node in range(len(G.nodes)):
+                if cheapest[node] is not None:
+                    weight, u, v = cheapest[node]
+                    if ds.union(u, v):
+                        mst_edges.append((u, v))
+                        num_components -= 1
+                        added = True
+                        if events is not None:
+                            events.record(round_num, OP_ACCEPT, u, v, weight)
+                    elif events is not None:
+                        events.record(round_num, OP_REJECT, u, v, weight)
+            if not added:
+                break
 
-    is_valid, total_cost = validate_mst(G, mst_edges)
+    with phase(stats, 'validate'):
+        is_valid, total_cost = validate_mst(G, mst_edges)
     execution_time = time.perf_counter() - start_time
 
-    return {
+    result = {
         'edges': mst_edges,
         'total_cost': total_cost,
         'execution_time': execution_time,
         'is_valid': is_valid
-    }
\ No newline at end of file
+    }
+    if events is not None:
+        result['trace'] = events.to_array()
+    if stats is not None:
+        # Every round scans the full edge list once
+        stats.add('rounds', round_num)
+        stats.add('edges_scanned', round_num * len(G.edges))
+        result['instrumentation'] = stats.as_dict()
+    return result
\ No newline at end of file
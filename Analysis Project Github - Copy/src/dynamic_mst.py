@@ -0,0 +1,316 @@
+import time
+
+class LinkCutTree:
+    """Link-cut tree over array-backed splay trees with path-maximum aggregation.
+    Every operation is O(log n) amortized."""
+    def __init__(self):
+        self.left = []
+        self.right = []
+        self.parent = []
+        self.rev = []
+        self.val = []
+        self.best = []  # Node holding the maximum val in each splay subtree
+
+    def add_node(self, val):
+        node = len(self.val)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.parent.append(-1)
+        self.rev.append(False)
+        self.val.append(val)
+        self.best.append(node)
+        return node
+
+    def reset_node(self, node, val):
+        self.left[node] = self.right[node] = self.parent[node] = -1
+        self.rev[node] = False
+        self.val[node] = val
+        self.best[node] = node
+
+    def _is_root(self, x):
+        p = self.parent[x]
+        return p == -1 or (self.left[p] != x and self.right[p] != x)
+
+    def _push(self, x):
+        if self.rev[x]:
+            l, r = self.left[x], self.right[x]
+            self.left[x], self.right[x] = r, l
+            if l != -1:
+                self.rev[l] = not self.rev[l]
+            if r != -1:
+                self.rev[r] = not self.rev[r]
+            self.rev[x] = False
+
+    def _update(self, x):
+        best = x
+        for child in (self.left[x], self.right[x]):
+            if child != -1 and self.val[self.best[child]] > self.val[best]:
+                best = self.best[child]
+        self.best[x] = best
+
+    def _rotate(self, x):
+        p = self.parent[x]
+        g = self.parent[p]
+        if not self._is_root(p):
+            if self.left[g] == p:
+                self.left[g] = x
+            else:
+                self.right[g] = x
+        self.parent[x] = g
+        if self.left[p] == x:
+            self.left[p] = self.right[x]
+            if self.right[x] != -1:
+                self.parent[self.right[x]] = p
+            self.right[x] = p
+        else:
+            self.right[p] = self.left[x]
+            if self.left[x] != -1:
+                self.parent[self.left[x]] = p
+            self.left[x] = p
+        self.parent[p] = x
+        self._update(p)
+        self._update(x)
+
+    def _splay(self, x):
+        path = [x]
+        y = x
+        while not self._is_root(y):
+            y = self.parent[y]
+            path.append(y)
+        for node in reversed(path):
+            self._push(node)
+        while not self._is_root(x):
+            p = self.parent[x]
+            if not self._is_root(p):
+                g = self.parent[p]
+                if (self.left[g] == p) == (self.left[p] == x):
+                    self._rotate(p)
+                else:
+                    self._rotate(x)
+            self._rotate(x)
+
+    def _access(self, x):
+        last = -1
+        y = x
+        while y != -1:
+            self._splay(y)
+            self.right[y] = last
+            self._update(y)
+            last = y
+            y = self.parent[y]
+        self._splay(x)
+
+    def make_root(self, x):
+        self._access(x)
+        self.rev[x] = not self.rev[x]
+
+    def find_root(self, x):
+        self._access(x)
+        self._push(x)
+        while self.left[x] != -1:
+            x = self.left[x]
+            self._push(x)
+        self._splay(x)
+        return x
+
+    def connected(self, x, y):
+        return x == y or self.find_root(x) == self.find_root(y)
+
+    def link(self, x, y):
+        self.make_root(x)
+        self.parent[x] = y
+
+    def cut(self, x, y):
+        self.make_root(x)
+        self._access(y)
+        # x is now the only node left of y on the preferred path
+        self.left[y] = -1
+        self.parent[x] = -1
+        self._update(y)
+
+    def path_max(self, x, y):
+        """Return the node with the largest val on the tree path between x and y."""
+        self.make_root(x)
+        self._access(y)
+        return self.best[y]
+
+class DynamicMST:
+    """Minimum spanning forest maintained under edge insertions, deletions and weight updates.
+    Tree edges live in a link-cut tree as extra nodes carrying their weight, so an insertion
+    is a path-max query plus at most one swap in O(log n). Deleting a tree edge searches for
+    the cheapest non-tree edge leaving the smaller of the two halves it leaves behind."""
+    def __init__(self, G, mst_result):
+        self.lct = LinkCutTree()
+        self.vertex_node = {}
+        self.weights = {}        # (u, v) with u <= v -> weight, for every current edge
+        self.tree_edges = {}     # (u, v) -> link-cut node representing the edge
+        self.edge_of_node = {}   # link-cut node -> (u, v)
+        self.tree_adj = {}       # vertex -> neighbours in the forest
+        self.non_tree_adj = {}   # vertex -> keys of incident edges outside the forest
+        self.free_nodes = []
+        self.total_cost = 0.0
+
+        for node in G.nodes:
+            self._vertex(node)
+        for u, v, data in G.edges(data=True):
+            self.weights[self._key(u, v)] = data.get('weight', 1.0)
+        for u, v in mst_result['edges']:
+            self._link_edge(self._key(u, v))
+        for key in self.weights:
+            if key not in self.tree_edges:
+                self._add_non_tree(key)
+
+    @staticmethod
+    def _key(u, v):
+        return (u, v) if u <= v else (v, u)
+
+    def _vertex(self, x):
+        if x not in self.vertex_node:
+            self.vertex_node[x] = self.lct.add_node(float('-inf'))
+            self.tree_adj[x] = set()
+            self.non_tree_adj[x] = set()
+        return self.vertex_node[x]
+
+    def _link_edge(self, key):
+        w = self.weights[key]
+        if self.free_nodes:
+            node = self.free_nodes.pop()
+            self.lct.reset_node(node, w)
+        else:
+            node = self.lct.add_node(w)
+        u, v = key
+        self.lct.link(self._vertex(u), node)
+        self.lct.link(node, self._vertex(v))
+        self.tree_edges[key] = node
+        self.edge_of_node[node] = key
+        self.tree_adj[u].add(v)
+        self.tree_adj[v].add(u)
+        self.total_cost += w
+
+    def _cut_edge(self, key):
+        node = self.tree_edges.pop(key)
+        del self.edge_of_node[node]
+        u, v = key
+        self.lct.cut(self.vertex_node[u], node)
+        self.lct.cut(node, self.vertex_node[v])
+        self.tree_adj[u].discard(v)
+        self.tree_adj[v].discard(u)
+        self.free_nodes.append(node)
+        self.total_cost -= self.lct.val[node]
+
+    def _add_non_tree(self, key):
+        u, v = key
+        self.non_tree_adj[u].add(key)
+        self.non_tree_adj[v].add(key)
+
+    def _remove_non_tree(self, key):
+        u, v = key
+        self.non_tree_adj[u].discard(key)
+        self.non_tree_adj[v].discard(key)
+
+    def _offer(self, key):
+        """Add a non-forest edge, swapping it in if it beats the heaviest edge on its tree path."""
+        u, v = key
+        w = self.weights[key]
+        nu, nv = self._vertex(u), self._vertex(v)
+        if u == v:
+            self._add_non_tree(key)
+            return
+        if not self.lct.connected(nu, nv):
+            self._link_edge(key)
+            return
+        heaviest = self.lct.path_max(nu, nv)
+        if self.lct.val[heaviest] > w:
+            old_key = self.edge_of_node[heaviest]
+            self._cut_edge(old_key)
+            self._add_non_tree(old_key)
+            self._link_edge(key)
+        else:
+            self._add_non_tree(key)
+
+    def _smaller_side(self, u, v):
+        """Grow both halves of a just-cut tree in lockstep and return the one that finishes first."""
+        sides = [({u}, [u]), ({v}, [v])]
+        while True:
+            for seen, frontier in sides:
+                if not frontier:
+                    return seen
+                x = frontier.pop()
+                for y in self.tree_adj[x]:
+                    if y not in seen:
+                        seen.add(y)
+                        frontier.append(y)
+
+    def _replace(self, key):
+        """Cut a tree edge and reconnect its halves with the cheapest non-tree edge across the cut, if any."""
+        self._cut_edge(key)
+        side = self._smaller_side(*key)
+        best = None
+        for x in side:
+            for candidate in self.non_tree_adj[x]:
+                a, b = candidate
+                if (a in side) != (b in side) and (best is None or self.weights[candidate] < self.weights[best]):
+                    best = candidate
+        if best is not None:
+            self._remove_non_tree(best)
+            self._link_edge(best)
+
+    def insert_edge(self, u, v, weight=1.0):
+        key = self._key(u, v)
+        if key in self.weights:
+            self.update_weight(u, v, weight)
+            return
+        self.weights[key] = weight
+        self._offer(key)
+
+    def delete_edge(self, u, v):
+        key = self._key(u, v)
+        if key not in self.weights:
+            raise KeyError(f"Edge ({u}, {v}) is not in the graph")
+        if key in self.tree_edges:
+            del self.weights[key]
+            self._replace(key)
+        else:
+            self._remove_non_tree(key)
+            del self.weights[key]
+
+    def update_weight(self, u, v, weight):
+        key = self._key(u, v)
+        if key not in self.weights:
+            raise KeyError(f"Edge ({u}, {v}) is not in the graph")
+        old_weight = self.weights[key]
+        if key in self.tree_edges:
+            if weight <= old_weight:
+                # Still the cheapest way across its cut; only the stored weight changes
+                self._cut_edge(key)
+                self.weights[key] = weight
+                self._link_edge(key)
+            else:
+                # Heavier tree edge: drop it and let it compete with the other crossing edges
+                self.weights[key] = weight
+                self._add_non_tree(key)
+                self._replace(key)
+        else:
+            self._remove_non_tree(key)
+            self.weights[key] = weight
+            self._offer(key)
+
+    def apply_updates(self, updates):
+        """Apply a batch of ('insert', u, v, w), ('delete', u, v) or ('update', u, v, w) tuples.
+        Returns the current result dict with the batch time as execution_time."""
+        start_time = time.perf_counter()
+        handlers = {'insert': self.insert_edge, 'delete': self.delete_edge, 'update': self.update_weight}
+        for op, *args in updates:
+            handlers[op](*args)
+        result = self.result()
+        result['execution_time'] = time.perf_counter() - start_time
+        return result
+
+    def result(self):
+        """Return the current forest in the same shape as the MST algorithms' results."""
+        return {
+            'edges': list(self.tree_edges),
+            'total_cost': self.total_cost,
+            'execution_time': 0.0,
+            'is_valid': len(self.tree_edges) == len(self.vertex_node) - 1
+        }
\ No newline at end of file
@@ -0,0 +1,58 @@
+from array import array
+import numpy as np
+
+# Event op codes stored in the 'op' column of a trace
+OP_UNION = 0      # DisjointSet merged the roots u and v
+OP_CONTRACT = 1   # Karger contracted node v into node u
+OP_ACCEPT = 2     # Edge (u, v) added to the result
+OP_REJECT = 3     # Edge (u, v) considered and discarded
+
+OP_NAMES = {
+    OP_UNION: 'union',
+    OP_CONTRACT: 'contract',
+    OP_ACCEPT: 'accept',
+    OP_REJECT: 'reject'
+}
+
+TRACE_DTYPE = np.dtype([
+    ('step', np.int64),
+    ('op', np.uint8),
+    ('u', np.int64),
+    ('v', np.int64),
+    ('weight', np.float64)
+])
+
+class EventTrace:
+    """Append-only event log filled by an algorithm while it runs.
+    Columns are kept in typed arrays so recording stays cheap and compact."""
+    def __init__(self):
+        self.step = array('q')
+        self.op = array('B')
+        self.u = array('q')
+        self.v = array('q')
+        self.weight = array('d')
+
+    def record(self, step, op, u, v, weight=0.0):
+        self.step.append(step)
+        self.op.append(op)
+        self.u.append(u)
+        self.v.append(v)
+        self.weight.append(weight)
+
+    def __len__(self):
+        return len(self.op)
+
+    def to_array(self):
+        """Return the events as a structured NumPy array with TRACE_DTYPE."""
+        events = np.empty(len(self), dtype=TRACE_DTYPE)
+        if len(self):
+            events['step'] = np.frombuffer(self.step, dtype=np.int64)
+            events['op'] = np.frombuffer(self.op, dtype=np.uint8)
+            events['u'] = np.frombuffer(self.u, dtype=np.int64)
+            events['v'] = np.frombuffer(self.v, dtype=np.int64)
+            events['weight'] = np.frombuffer(self.weight, dtype=np.float64)
+        return events
+
+def select_events(events, op):
+    """Return the rows of a trace array with the given op code, in recorded order."""
+    return events[events['op'] == op]
\ No newline at end of file
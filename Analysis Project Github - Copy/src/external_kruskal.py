@@ -0,0 +1,187 @@
+import heapq
+import os
+import random
+import shutil
+import tempfile
+import time
+import numpy as np
+from graph_utils import DisjointSet
+from instrumentation import phase
+
+EDGE_DTYPE = np.dtype([('weight', np.float64), ('u', np.int64), ('v', np.int64)])
+
+def _last_weight_per_edge(us, vs, ws):
+    """Collapse repeated (u, v) / (v, u) lines of a chunk to their last weight, as nx.Graph.add_edge does."""
+    u = np.array(us, dtype=np.int64)
+    v = np.array(vs, dtype=np.int64)
+    w = np.array(ws, dtype=np.float64)
+    pairs = np.stack([np.minimum(u, v), np.maximum(u, v)], axis=1)
+    _, last = np.unique(pairs[::-1], axis=0, return_index=True)
+    keep = np.sort(len(w) - 1 - last)
+    return u[keep], v[keep], w[keep]
+
+def _read_edge_chunks(file_path, chunk_edges, node_map):
+    """Yield (u, v, w) arrays of at most chunk_edges edges, remapping node labels like load_graph.
+    An edge listed more than once within a chunk keeps its last weight, like load_graph; copies in
+    different chunks are all kept, so the MST then uses the cheapest of them."""
+    is_mtx = file_path.endswith('.mtx')
+    us, vs, ws = [], [], []
+    has_negative_weights = False
+    header_skipped = not is_mtx
+    with open(file_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#') or line.startswith('%'):
+                continue
+            if not header_skipped:
+                header_skipped = True  # .mtx size line
+                continue
+            parts = line.split()
+            if len(parts) < 2:
+                continue
+            u, v = int(parts[0]), int(parts[1])
+            if is_mtx:
+                u, v = u - 1, v - 1  # Adjust for 1-indexing
+            w = float(parts[2]) if len(parts) >= 3 else random.uniform(0, 100)  # Random weight if missing
+            if w < 0:
+                w = -w
+                has_negative_weights = True
+            u = node_map.setdefault(u, len(node_map))
+            v = node_map.setdefault(v, len(node_map))
+            if u == v:
+                continue  # Self-loops are never in a spanning tree, but their node still counts
+            us.append(u)
+            vs.append(v)
+            ws.append(w)
+            if len(ws) >= chunk_edges:
+                yield _last_weight_per_edge(us, vs, ws)
+                us, vs, ws = [], [], []
+    if ws:
+        yield _last_weight_per_edge(us, vs, ws)
+    if has_negative_weights:
+        print(f"Warning: Negative weights detected in {file_path}. Converted to positive by multiplying by -1.")
+
+def _local_spanning_forest(u, v, order):
+    """Return the positions (in weight order) of a minimum spanning forest of one chunk.
+    Edges outside it are the heaviest on some cycle within the chunk, so they are not in the global MST."""
+    labels, inverse = np.unique(np.concatenate([u, v]), return_inverse=True)
+    local_u, local_v = inverse[:len(u)].tolist(), inverse[len(u):].tolist()
+    ds = DisjointSet(len(labels))
+    return np.array([i for i in order.tolist() if ds.union(local_u[i], local_v[i])], dtype=np.int64)
+
+def _write_run(run_dir, run_id, u, v, w, keep):
+    path = os.path.join(run_dir, f'run_{run_id}.bin')
+    if len(keep) == 0:
+        return path, 0  # Empty files cannot be memory-mapped; _read_run skips empty runs
+    run = np.memmap(path, dtype=EDGE_DTYPE, mode='w+', shape=(len(keep),))
+    run['weight'] = w[keep]
+    run['u'] = u[keep]
+    run['v'] = v[keep]
+    run.flush()
+    del run
+    return path, len(keep)
+
+def _read_run(path, length, block_edges):
+    """Stream a sorted run back from disk a block at a time."""
+    if length == 0:
+        return
+    run = np.memmap(path, dtype=EDGE_DTYPE, mode='r', shape=(length,))
+    for start in range(0, length, block_edges):
+        block = run[start:start + block_edges]
+        yield from zip(block['weight'].tolist(), block['u'].tolist(), block['v'].tolist())
+    del run
+
+def _merge_to_run(run_dir, run_id, group, buffer_edges):
+    """Merge a group of sorted runs into one new run on disk, holding at most buffer_edges edges in memory."""
+    path = os.path.join(run_dir, f'run_{run_id}.bin')
+    total = sum(length for _, length in group)
+    if total == 0:
+        return path, 0
+    block = max(1, buffer_edges // (len(group) + 1))  # One block per input plus the output buffer
+    out = np.memmap(path, dtype=EDGE_DTYPE, mode='w+', shape=(total,))
+    merged = heapq.merge(*(_read_run(run_path, length, block) for run_path, length in group))
+    pos = 0
+    buffer = []
+    for edge in merged:
+        buffer.append(edge)
+        if len(buffer) == block:
+            out[pos:pos + block] = np.array(buffer, dtype=EDGE_DTYPE)
+            pos += block
+            buffer = []
+    if buffer:
+        out[pos:pos + len(buffer)] = np.array(buffer, dtype=EDGE_DTYPE)
+    out.flush()
+    del out
+    for run_path, length in group:
+        if length:
+            os.remove(run_path)
+    return path, total
+
+def external_kruskal(file_path, chunk_edges=1_000_000, prefilter=True, merge_buffer_edges=None, max_fan_in=64, tmp_dir=None, stats=None):
+    """Out-of-core Kruskal over an .edges/.mtx file that never builds the whole graph in memory.
+    Edges are read in chunks, sorted (optionally reduced to each chunk's spanning forest) into
+    memory-mapped run files, and k-way merged by weight into a union-find over the nodes.
+    Runs are merged on disk in passes of at most max_fan_in, and every merge shares a buffer of
+    merge_buffer_edges (default chunk_edges), so peak memory is O(n + chunk_edges + max_fan_in)
+    whatever the number of edges. Returns the minimum spanning forest of the whole file;
+    is_valid is True when it is a single spanning tree. Unlike load_graph, the file is not cut down to
+    its largest component, and an edge repeated across chunks keeps its cheapest weight rather than
+    its last one; num_edges counts edges after per-chunk deduplication."""
+    start_time = time.perf_counter()
+    buffer_edges = merge_buffer_edges or chunk_edges
+    max_fan_in = max(2, max_fan_in)
+    node_map = {}
+    run_dir = tempfile.mkdtemp(prefix='external_kruskal_', dir=tmp_dir)
+    runs = []
+    num_edges = 0
+    try:
+        with phase(stats, 'sort'):
+            for u, v, w in _read_edge_chunks(file_path, chunk_edges, node_map):
+                num_edges += len(w)
+                order = np.argsort(w, kind='stable')
+                keep = _local_spanning_forest(u, v, order) if prefilter else order
+                runs.append(_write_run(run_dir, len(runs), u, v, w, keep))
+        num_runs = len(runs)
+
+        with phase(stats, 'merge'):
+            next_run_id = num_runs
+            while len(runs) > max_fan_in:
+                merged_runs = []
+                for start in range(0, len(runs), max_fan_in):
+                    merged_runs.append(_merge_to_run(run_dir, next_run_id, runs[start:start + max_fan_in], buffer_edges))
+                    next_run_id += 1
+                runs = merged_runs
+
+        num_nodes = len(node_map)
+        ds = DisjointSet(num_nodes)
+        mst_edges = []
+        total_cost = 0.0
+        scanned = 0
+        with phase(stats, 'main_loop'):
+            block = max(1, buffer_edges // max(1, len(runs)))
+            merged = heapq.merge(*(_read_run(path, length, block) for path, length in runs))
+            for w, u, v in merged:
+                scanned += 1
+                if ds.union(u, v):
+                    mst_edges.append((u, v))
+                    total_cost += w
+                    if len(mst_edges) == num_nodes - 1:
+                        break
+            merged.close()  # Release the run memmaps before the directory is removed
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+    execution_time = time.perf_counter() - start_time
+
+    result = {
+        'edges': mst_edges,
+        'total_cost': total_cost,
+        'execution_time': execution_time,
+        'is_valid': num_nodes > 0 and len(mst_edges) == num_nodes - 1,
+        'num_nodes': num_nodes,
+        'num_edges': num_edges
+    }
+    if stats is not None:
+        stats.add('edges_scanned', scanned)
+        stats.add('runs', num_runs)
+        result['instrumentation'] = stats.as_dict()
+    return result
\ No newline at end of file
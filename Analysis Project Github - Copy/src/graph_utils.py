@@ -1,18 +1,20 @@
 import networkx as nx
 import os
 import random
+from event_trace import OP_UNION
 
 class DisjointSet:
-    def __init__(self, n):
+    def __init__(self, n, trace=None):
         self.parent = list(range(n))
         self.rank = [0] * n
+        self.trace = trace  # Optional EventTrace receiving root merges, numbered by the caller's step
 
     def find(self, x):
         if self.parent[x] != x:
             self.parent[x] = self.find(self.parent[x])
         return self.parent[x]
 
-    def union(self, x, y):
+    def union(self, x, y, step=0):
         px, py = self.find(x), self.find(y)
         if px == py:
             return False
@@ -21,8 +23,32 @@ class DisjointSet:
         self.parent[py] = px
         if self.rank[px] == self.rank[py]:
             self.rank[px] += 1
+        if self.trace is not None:
+            self.trace.record(step, OP_UNION, px, py)
         return True
 
+class InstrumentedDisjointSet(DisjointSet):
+    """DisjointSet that counts find calls and path-compression steps into an Instrumentation."""
+    def __init__(self, n, stats, trace=None):
+        super().__init__(n, trace=trace)
+        self.stats = stats
+
+    def find(self, x):
+        self.stats.counters['find_calls'] += 1
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root:
+            self.parent[x], x = root, self.parent[x]
+            self.stats.counters['compression_steps'] += 1
+        return root
+
+def make_disjoint_set(n, trace=None, stats=None):
+    """Return a plain DisjointSet, or an instrumented one when stats is given and counting."""
+    if stats is None or not stats.counting:
+        return DisjointSet(n, trace=trace)
+    return InstrumentedDisjointSet(n, stats, trace=trace)
+
 def load_graph(file_path):
     """Load a weighted, undirected graph from .edges or .mtx file with node remapping.
     If weights are missing, assign random weights between 0 and 100."""
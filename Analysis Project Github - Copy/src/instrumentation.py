@@ -0,0 +1,80 @@
+import os
+import time
+import pstats
+from contextlib import contextmanager, nullcontext
+
+COUNTERS = ['find_calls', 'compression_steps', 'heap_pushes', 'heap_pops', 'edges_scanned', 'rounds', 'connectivity_checks', 'contractions', 'runs']
+
+class Instrumentation:
+    """Per-run counters and phase timings shared by the algorithms and DisjointSet.
+    Algorithms only touch it when one is passed in, so runs without it are unaffected.
+    An optional MemoryTracker also measures memory over the same phases. With counting=False only
+    phases are recorded and the algorithms keep their plain DisjointSet, so memory is measured on
+    the same code path that is timed."""
+    def __init__(self, memory=None, counting=True):
+        self.counters = {name: 0 for name in COUNTERS}
+        self.phases = {}
+        self.memory = memory
+        self.counting = counting
+
+    def add(self, name, amount=1):
+        if not self.counting:
+            return
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def phase(self, name):
+        with self.memory.phase(name) if self.memory is not None else nullcontext():
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def as_dict(self):
+        return {'counters': dict(self.counters), 'phases': dict(self.phases)}
+
+def phase(stats, name):
+    """Time a phase on stats, or do nothing when instrumentation is off."""
+    return stats.phase(name) if stats is not None else nullcontext()
+
+def _collapsed_stacks(profile_stats, max_depth=64):
+    """Expand the cProfile caller graph into collapsed stacks (frame;frame value).
+    Self time of a function is split across its callers in proportion to their cumulative time."""
+    def label(func):
+        filename, line, name = func
+        return f"{name} ({os.path.basename(filename)}:{line})"
+
+    children = {}
+    roots = []
+    for func, (cc, nc, tt, ct, callers) in profile_stats.stats.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((func, edge[3]))
+
+    lines = {}
+    stack = [(root, [label(root)], 1.0, {root}) for root in roots]
+    while stack:
+        func, path, share, seen = stack.pop()
+        cc, nc, tt, ct, callers = profile_stats.stats[func]
+        self_us = int(tt * share * 1e6)
+        if self_us > 0:
+            key = ';'.join(path)
+            lines[key] = lines.get(key, 0) + self_us
+        if len(path) >= max_depth:
+            continue
+        for child, edge_ct in children.get(func, []):
+            child_ct = profile_stats.stats[child][3]
+            if child in seen or child_ct <= 0:
+                continue
+            stack.append((child, path + [label(child)], share * min(1.0, edge_ct / child_ct), seen | {child}))
+    return [f"{key} {value}" for key, value in lines.items()]
+
+def dump_profile(profiler, path_prefix):
+    """Write <prefix>.prof (pstats) and <prefix>.collapsed (flamegraph.pl / speedscope input)."""
+    profiler.dump_stats(f"{path_prefix}.prof")
+    profile_stats = pstats.Stats(profiler)
+    with open(f"{path_prefix}.collapsed", 'w') as f:
+        f.write('\n'.join(_collapsed_stacks(profile_stats)))
+    return f"{path_prefix}.prof", f"{path_prefix}.collapsed"
\ No newline at end of file
@@ -1,14 +1,17 @@
 import time
 import random
-from graph_utils import DisjointSet
+from graph_utils import make_disjoint_set
+from event_trace import EventTrace, OP_CONTRACT
+from instrumentation import phase
 from tqdm import tqdm
 import networkx as nx
 from multiprocessing import Lock
 
 tqdm_lock = Lock()
 
-def karger(G, seed=None):
-    """Karger's algorithm for min-cut, optimized with progress tracking."""
+def karger(G, seed=None, trace=False, stats=None):
+    """Karger's algorithm for min-cut, optimized with progress tracking.
+    With trace=True the contractions of the trial that produced the best cut are returned under 'trace'."""
     start_time = time.perf_counter()
     if seed is not None:
         random.seed(seed)
@@ -23,6 +26,7 @@ def karger(G, seed=None):
 
     best_cut_size = float('inf')
     best_cut_edges = []
+    best_events = None
     num_runs = 5
 
     with tqdm_lock:
@@ -30,24 +34,33 @@ def karger(G, seed=None):
 
     for _ in range(num_runs):
         H = G.copy()
-        ds = DisjointSet(len(H.nodes))
+        events = EventTrace() if trace else None
+        ds = make_disjoint_set(len(H.nodes), trace=events, stats=stats)
         num_nodes = len(H.nodes)
 
-        while num_nodes > 2:
-            valid_edges = [(u, v) for u, v in H.edges() if ds.find(u) != ds.find(v)]
-            if not valid_edges:
-                break
-            u, v = random.choice(valid_edges)
-            ds.union(u, v)
-            for neighbor in list(H.neighbors(v)):
-                if neighbor != u:
-                    weight = H[v][neighbor].get('weight', 1.0)
-                    if H.has_edge(u, neighbor):
-                        H[u][neighbor]['weight'] = H[u][neighbor].get('weight', 1.0) + weight
-                    else:
-                        H.add_edge(u, neighbor, weight=weight)
-            H.remove_node(v)
-            num_nodes -= 1
+        with phase(stats, 'main_loop'):
+            while num_nodes > 2:
+                valid_edges = [(u, v) for u, v in H.edges() if ds.find(u) != ds.find(v)]
+                if stats is not None and stats.counting:
+                    stats.add('edges_scanned', H.number_of_edges())
+                if not valid_edges:
+                    break
+                u, v = random.choice(valid_edges)
+                if stats is not None and stats.counting:
+                    stats.add('contractions')
+                step = len(G.nodes) - num_nodes
+                if events is not None:
+                    events.record(step, OP_CONTRACT, u, v, H[u][v].get('weight', 1.0))
+                ds.union(u, v, step)
+                for neighbor in list(H.neighbors(v)):
+                    if neighbor != u:
+                        weight = H[v][neighbor].get('weight', 1.0)
+                        if H.has_edge(u, neighbor):
+                            H[u][neighbor]['weight'] = H[u][neighbor].get('weight', 1.0) + weight
+                        else:
+                            H.add_edge(u, neighbor, weight=weight)
+                H.remove_node(v)
+                num_nodes -= 1
 
         components = {}
         for node in G.nodes():
@@ -73,15 +86,21 @@ def karger(G, seed=None):
         if best_cut_edges == [] or cut_size < best_cut_size:
             best_cut_size = cut_size
             best_cut_edges = cut_edges
+            best_events = events
 
         pbar.update(1)
 
     pbar.close()
     execution_time = time.perf_counter() - start_time
 
-    return {
+    result = {
         'edges': best_cut_edges,
         'total_cost': best_cut_size,  # Always show the actual cut size, even if negative
         'execution_time': execution_time,
         'is_valid': bool(best_cut_edges)
-    }
\ No newline at end of file
+    }
+    if best_events is not None:
+        result['trace'] = best_events.to_array()
+    if stats is not None:
+        result['instrumentation'] = stats.as_dict()
+    return result
\ No newline at end of file
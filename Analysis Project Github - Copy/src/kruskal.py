@@ -1,22 +1,42 @@
 import time
-from graph_utils import DisjointSet, validate_mst
+from graph_utils import make_disjoint_set, validate_mst
+from event_trace import EventTrace, OP_ACCEPT, OP_REJECT
+from instrumentation import phase
 
-def kruskal(G):
+def kruskal(G, trace=False, stats=None):
     start_time = time.perf_counter()
-    ds = DisjointSet(len(G.nodes))
-    edges = sorted(G.edges(data=True), key=lambda x: x[2].get('weight', 1.0))
+    events = EventTrace() if trace else None
+    ds = make_disjoint_set(len(G.nodes), stats=stats)
+    with phase(stats, 'sort'):
+        edges = sorted(G.edges(data=True), key=lambda x: x[2].get('weight', 1.0))
     mst_edges = []
 
-    for u, v, data in edges:
-        if ds.union(u, v):
-            mst_edges.append((u, v))
+    with phase(stats, 'main_loop'):
+        if events is None:
+            for u, v, data in edges:
+                if ds.union(u, v):
+                    mst_edges.append((u, v))
+        else:
+            for step, (u, v, data) in enumerate(edges):
+                if ds.union(u, v):
+                    mst_edges.append((u, v))
+                    events.record(step, OP_ACCEPT, u, v, data.get('weight', 1.0))
+                else:
+                    events.record(step, OP_REJECT, u, v, data.get('weight', 1.0))
 
-    is_valid, total_cost = validate_mst(G, mst_edges)
+    with phase(stats, 'validate'):
+        is_valid, total_cost = validate_mst(G, mst_edges)
     execution_time = time.perf_counter() - start_time
 
-    return {
+    result = {
         'edges': mst_edges,
         'total_cost': total_cost,
         'execution_time': execution_time,
         'is_valid': is_valid
-    }
\ No newline at end of file
+    }
+    if events is not None:
+        result['trace'] = events.to_array()
+    if stats is not None:
+        stats.add('edges_scanned', len(edges))
+        result['instrumentation'] = stats.as_dict()
+    return result
\ No newline at end of file
@@ -8,7 +8,14 @@ from boruvka import boruvka
 from reverse_delete import reverse_delete
 from karger import karger
 from visualize import visualize_mst_incremental
-from performance import plot_performance
+from performance import plot_performance, plot_memory
+from instrumentation import Instrumentation, dump_profile
+from memory_tracker import MemoryTracker, format_bytes
+from mst_query import BottleneckIndex
+from external_kruskal import external_kruskal
+from auto_select import auto_mst, graph_features, measurement_mode
+from contextlib import nullcontext
+import cProfile
 import traceback
 from multiprocessing import Lock
 from concurrent.futures import ProcessPoolExecutor, as_completed
@@ -32,19 +39,57 @@ def spinner(msg, stop_event):
         time.sleep(0.2)
     sys.stdout.write('\r' + ' ' * 80 + '\r')
 
-def run_algorithm(algo, G, dataset_name, algo_name, output_dir, num_nodes, num_edges, position, pos, complexity):
-    """Run an algorithm and visualize its result, returning result data."""
+def run_algorithm(algo, G, dataset_name, algo_name, output_dir, num_nodes, num_edges, position, pos, complexity, trace_events=False, instrument=False, profile_dir=None, track_memory=False, load_memory=None):
+    """Run an algorithm and visualize its result, returning result data.
+    With trace_events a second, untimed pass records the event trace that the video replays, so
+    execution_time comes from an untraced run. Karger gets one seed for both passes, and tracing does
+    not touch the RNG, so the replay shows the contractions of the timed run.
+    With instrument the result carries hot-path counters and phase timings under 'instrumentation'.
+    With profile_dir the run is profiled and .prof/.collapsed files are written per (dataset, algorithm).
+    With track_memory a second, untimed pass records peak RSS and traced allocations per phase under
+    'memory', together with load_memory measured when the dataset was loaded. tracemalloc and the RSS
+    sampler slow the algorithms down, so execution_time always comes from the untracked run; the
+    memory pass records phases only, so it runs the same uninstrumented code as the timed run."""
     try:
         print(f'Running {algo_name} on {dataset_name}...')
-        result = algo(G)
+        stats = Instrumentation() if instrument else None
+        seeded = {'seed': random.randrange(2 ** 32)} if algo_name == 'Karger' else {}
+        profiler = cProfile.Profile() if profile_dir else None
+        if profiler is not None:
+            profiler.enable()
+        result = algo(G, stats=stats, **seeded)
+        if profiler is not None:
+            profiler.disable()
+            os.makedirs(profile_dir, exist_ok=True)
+            prof_path, collapsed_path = dump_profile(profiler, os.path.join(profile_dir, f"{dataset_name}_{algo_name}"))
+            print(f"Profile saved: {prof_path}, {collapsed_path}")
         if result is None:
             print(f"Error: {algo_name} on {dataset_name} returned None")
             return None
+        if trace_events:
+            trace = algo(G, trace=True, **seeded).get('trace')
+            if trace is not None:
+                result['trace'] = trace
+        if track_memory:
+            print(f'Measuring memory of {algo_name} on {dataset_name}...')
+            memory = MemoryTracker()
+            with memory.phase('algorithm'):
+                algo(G, stats=Instrumentation(memory=memory, counting=False))
+            result['memory'] = memory.as_dict()
+            if load_memory is not None:
+                result['memory']['load'] = load_memory
         if algo_name == 'Karger':
             print(f"{algo_name} - Cut Size: {result['total_cost']:.2f}, Time: {result['execution_time']:.4f}s")
         else:
             print(f"{algo_name} - Valid MST: {result['is_valid']}, Total Cost: {result['total_cost']:.2f}, Time: {result['execution_time']:.4f}s")
-        visualize_mst_incremental(G, result['edges'], dataset_name, algo_name, output_dir, position, pos=pos, execution_time=result['execution_time'], complexity=complexity)
+        if 'instrumentation' in result:
+            counters = {k: v for k, v in result['instrumentation']['counters'].items() if v}
+            phases = {k: round(v, 4) for k, v in result['instrumentation']['phases'].items()}
+            print(f"{algo_name} - Counters: {counters}, Phases: {phases}")
+        if 'memory' in result:
+            peaks = {name: format_bytes(values['peak_traced']) for name, values in result['memory'].items()}
+            print(f"{algo_name} - Peak RSS: {format_bytes(result['memory']['algorithm']['peak_rss'])}, Peak traced allocations: {peaks}")
+        visualize_mst_incremental(G, result['edges'], dataset_name, algo_name, output_dir, position, pos=pos, execution_time=result['execution_time'], complexity=complexity, trace=result.get('trace'))
         return {'algo_name': algo_name, 'result': result, 'num_nodes': num_nodes, 'num_edges': num_edges}
     except Exception as e:
         print(f"Error running {algo_name} on {dataset_name}: {str(e)}")
@@ -54,6 +99,13 @@ def run_algorithm(algo, G, dataset_name, algo_name, output_dir, num_nodes, num_e
 def main():
     data_dir = 'data'
     output_dir = 'visualizations'
+    trace_events = True  # Record event traces in an untimed pass so videos replay the timed run
+    instrument = False  # Collect hot-path counters and phase timings per run
+    profile_dir = None  # Set to a directory (e.g. 'profiles') to dump cProfile and collapsed stacks per run
+    track_memory = False  # Record peak RSS and tracemalloc allocations for load, algorithm and validation phases
+    build_query_index = False  # Save a bottleneck/path query index of the Kruskal MST next to the layout cache
+    external_memory_threshold = None  # Dataset file size in bytes above which only out-of-core Kruskal runs
+    auto_only = False  # Run only the engine the cost model predicts fastest, skipping layouts and videos
     complexities = {
         'Kruskal': 'O(m log m)',
         'Prim': 'O(m log n)',
@@ -75,6 +127,9 @@ def main():
     if os.path.exists(results_file):
         with open(results_file, 'rb') as f:
             results_by_algo = pickle.load(f)
+        # Entries are (dataset_name, nodes, edges, time, metrics); upgrade older (nodes, edges, time) records
+        for name, records in results_by_algo.items():
+            results_by_algo[name] = [('', *r, {}) if len(r) == 3 else r for r in records]
     else:
         results_by_algo = {name: [] for name in algorithm_names}
 
@@ -101,10 +156,40 @@ def main():
         for dataset in dataset_files:
             dataset_name = os.path.basename(dataset).split('.')[0]
             print(f'\nProcessing {dataset_name}...')
-            G = load_graph(dataset)
+            if external_memory_threshold is not None and os.path.getsize(dataset) > external_memory_threshold:
+                # Too large to load as an nx.Graph: stream the file through external Kruskal instead
+                print(f"{dataset_name} exceeds {external_memory_threshold} bytes, running External Kruskal only...")
+                result = external_kruskal(dataset, stats=Instrumentation() if instrument else None)
+                print(f"External Kruskal - Valid MST: {result['is_valid']}, Total Cost: {result['total_cost']:.2f}, Time: {result['execution_time']:.4f}s")
+                metrics = {'measurement': measurement_mode(instrument=instrument)}
+                if 'instrumentation' in result:
+                    metrics['instrumentation'] = result['instrumentation']
+                results_by_algo.setdefault('External Kruskal', []).append((
+                    dataset_name,
+                    result['num_nodes'],
+                    result['num_edges'],
+                    result['execution_time'],
+                    metrics
+                ))
+                with tqdm_lock:
+                    dataset_pbar.update(1)
+                continue
+            load_tracker = MemoryTracker() if track_memory else None
+            with load_tracker.phase('load') if load_tracker is not None else nullcontext():
+                G = load_graph(dataset)
+            load_memory = load_tracker.as_dict()['load'] if load_tracker is not None else None
             num_nodes = len(G.nodes)
             num_edges = len(G.edges)
             print(f"{dataset_name}: Nodes={num_nodes}, Edges={num_edges}")
+            features = graph_features(G)
+
+            if auto_only:
+                result = auto_mst(G, results_by_algo, dataset_name, stats=Instrumentation() if instrument else None)
+                print(f"Auto ({result['engine']}) - Valid MST: {result['is_valid']}, Total Cost: {result['total_cost']:.2f}")
+                G.clear()
+                with tqdm_lock:
+                    dataset_pbar.update(1)
+                continue
 
             # Load or compute layout with caching and error handling
             pos_file = os.path.join(output_dir, f'{dataset_name}_pos.pkl')
@@ -141,6 +226,7 @@ def main():
                 layout_pbar.close()
 
             # Run algorithms with progress bar
+            kruskal_result = None
             with tqdm(total=len(algorithms), desc=f"Algorithms for {dataset_name}", unit="algo", position=2, leave=False) as algo_pbar:
                 futures = {}
                 with ProcessPoolExecutor(max_workers=4) as executor:
@@ -150,12 +236,14 @@ def main():
                         if os.path.exists(mp4_path) and os.path.exists(png_path):
                             print(f"Skipping {algo_name} on {dataset_name} (MP4 and PNG already exist).")
                             # Check if result exists in results_by_algo
-                            existing = [r for r in results_by_algo[algo_name] if r[0] == num_nodes and r[1] == num_edges]
+                            existing = [r for r in results_by_algo[algo_name] if r[1] == num_nodes and r[2] == num_edges]
                             if not existing:
                                 print(f"Running {algo_name} to collect missing performance data...")
                                 G_copy = nx.Graph(G)
                                 future = executor.submit(
-                                    run_algorithm, algo, G_copy, dataset_name, algo_name, output_dir, num_nodes, num_edges, i, pos, complexities[algo_name]
+                                    run_algorithm, algo, G_copy, dataset_name, algo_name, output_dir, num_nodes, num_edges, i, pos, complexities[algo_name],
+                                    trace_events=trace_events, instrument=instrument, profile_dir=profile_dir,
+                                    track_memory=track_memory, load_memory=load_memory
                                 )
                                 futures[future] = algo_name
                             else:
@@ -164,7 +252,9 @@ def main():
                         else:
                             G_copy = nx.Graph(G)
                             future = executor.submit(
-                                run_algorithm, algo, G_copy, dataset_name, algo_name, output_dir, num_nodes, num_edges, i, pos, complexities[algo_name]
+                                run_algorithm, algo, G_copy, dataset_name, algo_name, output_dir, num_nodes, num_edges, i, pos, complexities[algo_name],
+                                trace_events=trace_events, instrument=instrument, profile_dir=profile_dir,
+                                track_memory=track_memory, load_memory=load_memory
                             )
                             futures[future] = algo_name
 
@@ -172,17 +262,38 @@ def main():
                         algo_name = futures[future]
                         result_data = future.result()
                         if result_data and result_data['result']:
+                            metrics = {
+                                'features': features,
+                                'measurement': measurement_mode(instrument=instrument, profile=profile_dir, track_memory=track_memory)
+                            }
+                            for key in ('instrumentation', 'memory'):
+                                if key in result_data['result']:
+                                    metrics[key] = result_data['result'][key]
                             results_by_algo[algo_name].append((
+                                dataset_name,
                                 result_data['num_nodes'],
                                 result_data['num_edges'],
-                                result_data['result']['execution_time']
+                                result_data['result']['execution_time'],
+                                metrics
                             ))
-                            print(f"Stored result for {algo_name} on {dataset_name}: Nodes={num_nodes}, Edges={num_edges}, Time={result_data['result']['execution_time']:.4f}s")
+                            memory_str = f", Peak RSS={format_bytes(metrics['memory']['algorithm']['peak_rss'])}" if 'memory' in metrics else ""
+                            print(f"Stored result for {algo_name} on {dataset_name}: Nodes={num_nodes}, Edges={num_edges}, Time={result_data['result']['execution_time']:.4f}s{memory_str}")
                         else:
                             print(f"No result stored for {algo_name} on {dataset_name}")
+                        if algo_name == 'Kruskal' and result_data:
+                            kruskal_result = result_data['result']
                         with tqdm_lock:
                             algo_pbar.update(1)
 
+            index_file = os.path.join(output_dir, f'{dataset_name}_mst_index.npz')
+            if build_query_index and not os.path.exists(index_file):
+                # Kruskal is skipped when its outputs are cached, so compute the MST here if needed
+                mst_result = kruskal_result if kruskal_result is not None else kruskal(G)
+                if mst_result['is_valid']:
+                    index = BottleneckIndex.from_result(G, mst_result)
+                    index.save(index_file)
+                    print(f"Saved MST query index to {index_file} (cycle-property certificate: {index.certify(G)})")
+
             G.clear()
             with tqdm_lock:
                 dataset_pbar.update(1)
@@ -194,6 +305,8 @@ def main():
             pickle.dump(results_by_algo, f)
         print("Results before plotting:", {k: len(v) for k, v in results_by_algo.items()})
         plot_performance(results_by_algo, output_dir)
+        if track_memory:
+            plot_memory(results_by_algo, output_dir)
         plot_pbar.update(1)
 
     print("\nAll datasets processed.")
@@ -0,0 +1,78 @@
+import threading
+import tracemalloc
+from contextlib import contextmanager
+import psutil
+
+class MemoryTracker:
+    """Peak RSS and tracemalloc-attributed allocations per named phase.
+    Phases may nest; an outer phase's peak includes its inner phases."""
+    def __init__(self, sample_interval=0.005):
+        self.sample_interval = sample_interval
+        self.process = psutil.Process()
+        self.phases = {}
+        self._open = []  # Stack of per-phase records currently being measured
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop = threading.Event()
+        self._started_tracemalloc = False
+
+    def _sample(self):
+        while not self._stop.wait(self.sample_interval):
+            self._record_rss()
+
+    def _record_rss(self):
+        rss = self.process.memory_info().rss
+        with self._lock:
+            for record in self._open:
+                record['peak_rss'] = max(record['peak_rss'], rss)
+
+    def _fold_traced_peak(self):
+        # tracemalloc keeps a single peak, so fold it into every open phase before resetting it
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            for record in self._open:
+                record['peak_traced'] = max(record['peak_traced'], peak - record['traced_start'])
+        tracemalloc.reset_peak()
+        return current
+
+    @contextmanager
+    def phase(self, name):
+        if not self._open:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample, daemon=True)
+            self._sampler.start()
+        current = self._fold_traced_peak()
+        rss = self.process.memory_info().rss
+        record = {'rss_start': rss, 'peak_rss': rss, 'traced_start': current, 'peak_traced': 0}
+        with self._lock:
+            self._open.append(record)
+        try:
+            yield
+        finally:
+            self._fold_traced_peak()
+            self._record_rss()
+            with self._lock:
+                self._open.pop()
+            measured = {
+                'peak_rss': record['peak_rss'],
+                'rss_delta': record['peak_rss'] - record['rss_start'],
+                'peak_traced': record['peak_traced']
+            }
+            # Repeated phases (e.g. Karger trials) keep the worst case
+            previous = self.phases.get(name, measured)
+            self.phases[name] = {key: max(value, previous[key]) for key, value in measured.items()}
+            if not self._open:
+                self._stop.set()
+                self._sampler.join()
+                if self._started_tracemalloc:
+                    tracemalloc.stop()
+                    self._started_tracemalloc = False
+
+    def as_dict(self):
+        return {name: dict(values) for name, values in self.phases.items()}
+
+def format_bytes(num_bytes):
+    return f"{num_bytes / (1024 * 1024):.1f}MB"
\ No newline at end of file
@@ -0,0 +1,116 @@
+import numpy as np
+
+class BottleneckIndex:
+    """Binary-lifting LCA index over an MST (or spanning forest) with path-max and path-cost tables.
+    Built once in O(n log n); each (u, v) query is O(log n) and batches are answered with vectorized NumPy."""
+    def __init__(self, up, up_max, depth, dist, component):
+        self.up = up            # up[k][x]: 2^k-th ancestor of x (roots point to themselves)
+        self.up_max = up_max    # up_max[k][x]: heaviest edge on the 2^k steps above x
+        self.depth = depth
+        self.dist = dist        # Weighted distance from x to its tree root
+        self.component = component
+
+    @classmethod
+    def from_result(cls, G, mst_result):
+        """Build the index from an algorithm result's 'edges', taking weights from G."""
+        n = len(G.nodes)
+        adjacency = [[] for _ in range(n)]
+        for u, v in mst_result['edges']:
+            w = G[u][v].get('weight', 1.0)
+            adjacency[u].append((v, w))
+            adjacency[v].append((u, w))
+
+        parent = np.arange(n, dtype=np.int64)
+        parent_weight = np.zeros(n, dtype=np.float64)
+        depth = np.zeros(n, dtype=np.int64)
+        dist = np.zeros(n, dtype=np.float64)
+        component = np.full(n, -1, dtype=np.int64)
+        for root in range(n):
+            if component[root] != -1:
+                continue
+            component[root] = root
+            stack = [root]
+            while stack:
+                x = stack.pop()
+                for y, w in adjacency[x]:
+                    if component[y] == -1:
+                        component[y] = root
+                        parent[y] = x
+                        parent_weight[y] = w
+                        depth[y] = depth[x] + 1
+                        dist[y] = dist[x] + w
+                        stack.append(y)
+
+        levels = max(1, int(depth.max()).bit_length()) if n else 1
+        up = np.empty((levels, n), dtype=np.int64)
+        up_max = np.empty((levels, n), dtype=np.float64)
+        up[0] = parent
+        up_max[0] = parent_weight
+        for k in range(1, levels):
+            up[k] = up[k - 1][up[k - 1]]
+            up_max[k] = np.maximum(up_max[k - 1], up_max[k - 1][up[k - 1]])
+        return cls(up, up_max, depth, dist, component)
+
+    def _lca_with_max(self, u, v):
+        """Return (lca, path_max) arrays for node arrays u and v in the same component."""
+        u = np.array(u, dtype=np.int64)
+        v = np.array(v, dtype=np.int64)
+        swap = self.depth[u] < self.depth[v]
+        u[swap], v[swap] = v[swap], u[swap]
+        path_max = np.zeros(len(u), dtype=np.float64)
+
+        # Lift the deeper endpoint to the other's depth
+        diff = self.depth[u] - self.depth[v]
+        for k in range(len(self.up)):
+            jump = (diff >> k) & 1 == 1
+            path_max[jump] = np.maximum(path_max[jump], self.up_max[k][u[jump]])
+            u[jump] = self.up[k][u[jump]]
+
+        # Lift both while their ancestors differ
+        for k in range(len(self.up) - 1, -1, -1):
+            jump = self.up[k][u] != self.up[k][v]
+            path_max[jump] = np.maximum(path_max[jump], np.maximum(self.up_max[k][u[jump]], self.up_max[k][v[jump]]))
+            u[jump] = self.up[k][u[jump]]
+            v[jump] = self.up[k][v[jump]]
+
+        differ = u != v
+        path_max[differ] = np.maximum(path_max[differ], np.maximum(self.up_max[0][u[differ]], self.up_max[0][v[differ]]))
+        u[differ] = self.up[0][u[differ]]
+        return u, path_max
+
+    def bottleneck(self, u, v):
+        """Minimax edge weight on the tree path for each (u[i], v[i]); inf when they are not connected."""
+        u = np.atleast_1d(np.asarray(u, dtype=np.int64))
+        v = np.atleast_1d(np.asarray(v, dtype=np.int64))
+        result = np.full(len(u), np.inf)
+        same = self.component[u] == self.component[v]
+        result[same] = self._lca_with_max(u[same], v[same])[1]
+        return result
+
+    def path_cost(self, u, v):
+        """Total weight of the tree path for each (u[i], v[i]); inf when they are not connected."""
+        u = np.atleast_1d(np.asarray(u, dtype=np.int64))
+        v = np.atleast_1d(np.asarray(v, dtype=np.int64))
+        result = np.full(len(u), np.inf)
+        same = self.component[u] == self.component[v]
+        lca = self._lca_with_max(u[same], v[same])[0]
+        result[same] = self.dist[u[same]] + self.dist[v[same]] - 2 * self.dist[lca]
+        return result
+
+    def certify(self, G):
+        """Check the cycle property: no graph edge is lighter than the heaviest tree edge on its tree path.
+        Together with validate_mst's spanning-tree check this certifies minimality in O(m log n)."""
+        if not G.edges:
+            return True
+        edges = np.array([(u, v, data.get('weight', 1.0)) for u, v, data in G.edges(data=True)], dtype=np.float64)
+        u = edges[:, 0].astype(np.int64)
+        v = edges[:, 1].astype(np.int64)
+        return bool(np.all(self.bottleneck(u, v) <= edges[:, 2]))
+
+    def save(self, path):
+        np.savez_compressed(path, up=self.up, up_max=self.up_max, depth=self.depth, dist=self.dist, component=self.component)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['up'], data['up_max'], data['depth'], data['dist'], data['component'])
\ No newline at end of file
@@ -48,4 +48,58 @@ def plot_performance(results_by_algo, output_dir='visualizations'):
     output_file = os.path.join(output_dir, 'performance_plot_3d.png')
     plt.savefig(output_file, dpi=300)
     plt.close()
-    print(f'3D Performance plot saved: {output_file}')
\ No newline at end of file
+    print(f'3D Performance plot saved: {output_file}')
+
+def plot_memory(results_by_algo, output_dir='visualizations', phase='algorithm'):
+    """Plot peak memory of a run phase in 3D (nodes, edges, peak traced MB) and in 2D against edges."""
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    fig = plt.figure(figsize=(18, 8))
+    ax = fig.add_subplot(121, projection='3d')
+    ax2 = fig.add_subplot(122)
+
+    markers = ['o', 's', '^', 'D', 'v']
+    colors = ['b', 'g', 'r', 'c', 'm', 'y', 'k']
+    plotted = False
+    for idx, (algo_name, data) in enumerate(results_by_algo.items()):
+        data = [x for x in data if len(x) > 4 and phase in x[4].get('memory', {})]
+        if not data:
+            print(f"No memory data for {algo_name}, skipping memory plot.")
+            continue
+        data.sort(key=lambda x: x[1])
+        dataset_names = [x[0] for x in data]
+        nodes = [x[1] for x in data]
+        edges = [x[2] for x in data]
+        traced_mb = [x[4]['memory'][phase]['peak_traced'] / (1024 * 1024) for x in data]
+        rss_mb = [x[4]['memory'][phase]['peak_rss'] / (1024 * 1024) for x in data]
+        print(f"Plotting memory for {algo_name}: {len(nodes)} points, Peak traced MB={traced_mb}, Peak RSS MB={rss_mb}")
+        color = colors[idx % len(colors)]
+        marker = markers[idx % len(markers)]
+        ax.scatter(nodes, edges, traced_mb, label=algo_name, marker=marker, s=50, color=color)
+        ax.plot(nodes, edges, traced_mb, color=color, linewidth=1, linestyle='dashed')
+        for j, txt in enumerate(dataset_names):
+            ax.text(nodes[j], edges[j], traced_mb[j] * 1.1, txt, fontsize=8, color=color)
+        ax2.plot(edges, traced_mb, marker=marker, color=color, label=f"{algo_name} (traced)")
+        ax2.plot(edges, rss_mb, marker=marker, color=color, linestyle='dotted', label=f"{algo_name} (peak RSS)")
+        plotted = True
+
+    ax.set_xlabel('Number of Nodes')
+    ax.set_ylabel('Number of Edges')
+    ax.set_zlabel('Peak Traced Memory (MB)')
+    ax.set_title(f'Peak Memory of {phase.capitalize()} Phase (3D)')
+    ax2.set_xlabel('Number of Edges')
+    ax2.set_ylabel('Memory (MB)')
+    ax2.set_xscale('log')
+    ax2.set_yscale('log')
+    ax2.set_title(f'Peak Memory vs Edges ({phase.capitalize()} Phase)')
+    if plotted:
+        ax.legend()
+        ax2.legend(fontsize=8)
+    ax.grid(True)
+    ax2.grid(True)
+
+    output_file = os.path.join(output_dir, f'memory_plot_{phase}.png')
+    plt.savefig(output_file, dpi=300)
+    plt.close()
+    print(f'Memory plot saved: {output_file}')
\ No newline at end of file
@@ -1,9 +1,12 @@
 import time
 import heapq
 from graph_utils import validate_mst
+from event_trace import EventTrace, OP_ACCEPT, OP_REJECT
+from instrumentation import phase
 
-def prim(G):
+def prim(G, trace=False, stats=None):
     start_time = time.perf_counter()
+    events = EventTrace() if trace else None
     if not G.nodes:
         return {
             'edges': [],
@@ -21,23 +24,41 @@ def prim(G):
     for v, data in G[start_node].items():
         heapq.heappush(edges, (data.get('weight', 1.0), start_node, v))
 
-    while edges and len(visited) < len(G.nodes):
-        weight, u, v = heapq.heappop(edges)
-        if v in visited:
-            continue
-        visited.add(v)
-        mst_edges.append((u, v))
-        total_cost += weight
-        for neighbor, data in G[v].items():
-            if neighbor not in visited:
-                heapq.heappush(edges, (data.get('weight', 1.0), v, neighbor))
+    step = 0
+    with phase(stats, 'main_loop'):
+        while edges and len(visited) < len(G.nodes):
+            weight, u, v = heapq.heappop(edges)
+            step += 1
+            if v in visited:
+                if events is not None:
+                    events.record(step, OP_REJECT, u, v, weight)
+                continue
+            visited.add(v)
+            mst_edges.append((u, v))
+            if events is not None:
+                events.record(step, OP_ACCEPT, u, v, weight)
+            total_cost += weight
+            for neighbor, data in G[v].items():
+                if neighbor not in visited:
+                    heapq.heappush(edges, (data.get('weight', 1.0), v, neighbor))
 
-    is_valid, total_cost = validate_mst(G, mst_edges)
+    with phase(stats, 'validate'):
+        is_valid, total_cost = validate_mst(G, mst_edges)
     execution_time = time.perf_counter() - start_time
 
-    return {
+    result = {
         'edges': mst_edges,
         'total_cost': total_cost,
         'execution_time': execution_time,
         'is_valid': is_valid
-    }
\ No newline at end of file
+    }
+    if events is not None:
+        result['trace'] = events.to_array()
+    if stats is not None:
+        # Derived after timing so the hot loop carries no counting: every push is
+        # either popped or still in the heap, and each visited node scanned its adjacency once
+        stats.add('heap_pops', step)
+        stats.add('heap_pushes', step + len(edges))
+        stats.add('edges_scanned', sum(len(G[node]) for node in visited))
+        result['instrumentation'] = stats.as_dict()
+    return result
\ No newline at end of file
@@ -1,27 +1,45 @@
 import time
 import networkx as nx
 from graph_utils import DisjointSet, validate_mst
+from event_trace import EventTrace, OP_ACCEPT, OP_REJECT
+from instrumentation import phase
 
-def reverse_delete(G):
+def reverse_delete(G, trace=False, stats=None):
     start_time = time.perf_counter()
-    edges = sorted(G.edges(data=True), key=lambda x: x[2].get('weight', 1.0), reverse=True)
+    events = EventTrace() if trace else None
+    with phase(stats, 'sort'):
+        edges = sorted(G.edges(data=True), key=lambda x: x[2].get('weight', 1.0), reverse=True)
     mst = G.copy()
     mst_edges = list(mst.edges())
 
-    for u, v, data in edges:
-        mst.remove_edge(u, v)
-        components = list(nx.connected_components(mst))
-        if len(components) > 1:
-            mst.add_edge(u, v, weight=data.get('weight', 1.0))
-        else:
-            mst_edges.remove((u, v) if (u, v) in mst_edges else (v, u))
+    with phase(stats, 'main_loop'):
+        for step, (u, v, data) in enumerate(edges):
+            mst.remove_edge(u, v)
+            if stats is not None and stats.counting:
+                stats.add('connectivity_checks')
+                stats.add('edges_scanned', mst.number_of_edges())  # Each check walks the remaining graph
+            components = list(nx.connected_components(mst))
+            if len(components) > 1:
+                mst.add_edge(u, v, weight=data.get('weight', 1.0))
+                if events is not None:
+                    events.record(step, OP_ACCEPT, u, v, data.get('weight', 1.0))
+            else:
+                mst_edges.remove((u, v) if (u, v) in mst_edges else (v, u))
+                if events is not None:
+                    events.record(step, OP_REJECT, u, v, data.get('weight', 1.0))
 
-    is_valid, total_cost = validate_mst(G, mst_edges)
+    with phase(stats, 'validate'):
+        is_valid, total_cost = validate_mst(G, mst_edges)
     execution_time = time.perf_counter() - start_time
 
-    return {
+    result = {
         'edges': mst_edges,
         'total_cost': total_cost,
         'execution_time': execution_time,
         'is_valid': is_valid
-    }
\ No newline at end of file
+    }
+    if events is not None:
+        result['trace'] = events.to_array()
+    if stats is not None:
+        result['instrumentation'] = stats.as_dict()
+    return result
\ No newline at end of file